@@ -1,175 +1,365 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import base64
+import codecs
 import datetime as dt
-import os
+import json
+import random
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from html.parser import HTMLParser
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError
+from http.client import HTTPException, HTTPSConnection
+from pathlib import Path
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORTS_DIR = ROOT / "reports"
+README_PATH = ROOT / "README.md"
+README_CACHE_PATH = ROOT / ".cache" / "readme_cache.json"
 
 TRENDING_URL = "https://github.com/trending?since=daily"
 KEYWORD = "ai"
 TOP_N = 15
+TRENDING_MAX_ITEMS = 25  # GitHub Trending lists at most 25 repos per page
+TRENDING_CHUNK_SIZE = 8192
 README_MAX_CHARS = 4000
+DESC_SUFFICIENT_CHARS = 60  # longer trending descriptions are used as the intro without a README fetch
+README_WORKERS = 8
+README_BRANCHES = ("main", "master")
+USER_AGENT = "Mozilla/5.0"
+HTTP_RETRIES = 2
+HTTP_BACKOFF = 0.2
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+HTTP_MAX_REDIRECTS = 3
+HTTP_MAX_RETRY_AFTER = 30
+HTTP_MAX_INFLIGHT = 8  # bursts above this against raw.githubusercontent.com start drawing 429s
+
+_WS_RE = re.compile(r"\s+")
+_CODEBLOCK_RE = re.compile(r"`{3}[\s\S]*?`{3}")
+_INLINE_CODE_RE = re.compile(r"`[^`]+`")
+_HEADING_RE = re.compile(r"^#")
+_LATEST_HEADING = "## 最新日报".encode("utf-8")
+_TOC_HEADING = "## 目录".encode("utf-8")
+# keyword as a standalone token: "ai-agent", "foo_ai", "AI驱动" match, "brain"/"dairy" don't
+_KEYWORD_RE = re.compile(rf"(?<![a-z0-9]){re.escape(KEYWORD)}(?![a-z0-9])", re.I)
+
+
+def _any_of(*patterns):
+    # one alternation per section so each line costs a single regex search
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.I)
+
+
+_INSTALL_RE = _any_of(r"installation", r"install", r"setup", r"快速开始", r"安装")
+_USAGE_RE = _any_of(r"usage", r"getting started", r"example", r"使用", r"用法", r"quickstart")
+_INTRO_RE = _any_of(r"^#", r"简介", r"about", r"overview")
+
+_ENTRY_TEMPLATE = "{i}. [{repo}](https://github.com/{repo})\n{fields}"
+
+_local = threading.local()
+_inflight = threading.BoundedSemaphore(HTTP_MAX_INFLIGHT)
+# branch probes run here rather than on the per-run README pool, so a waiting fetch never blocks its own probes
+_BRANCH_POOL = ThreadPoolExecutor(max_workers=README_WORKERS * len(README_BRANCHES))
+
+
+class _EnoughItems(Exception):
+    pass
+
 
 class TrendingParser(HTMLParser):
-    def __init__(self):
+    def __init__(self, max_items=None):
         super().__init__()
+        self.max_items = max_items
         self.in_h2 = False
-        self.in_a = False
-        self.in_desc = False
-        self.current_href = None
+        self.capture = None  # "p" while collecting description text
         self.current_text = []
-        self.current_desc = []
-        self.items = []  # list of dicts
+        # parallel lists, one slot per repo card
+        self.repos = []
+        self.descs = []
 
     def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
+        if self.capture:
+            # nested tags separate words; text itself may arrive split across feed() chunks
+            self.current_text.append(" ")
+        # only h2/a/p matter; skip attribute handling for every other tag on the page
         if tag == "h2":
             self.in_h2 = True
-        if self.in_h2 and tag == "a" and "href" in attrs_dict:
-            href = attrs_dict.get("href")
+        elif tag == "a" and self.in_h2:
+            href = _attr(attrs, "href")
             if href and href.startswith("/") and href.count("/") >= 2:
-                self.in_a = True
-                self.current_href = href
-                self.current_text = []
-        if tag == "p":
-            klass = attrs_dict.get("class", "")
-            if "col-9" in klass:
-                self.in_desc = True
-                self.current_desc = []
+                self.repos.append(href.lstrip("/"))
+                self.descs.append("")
+        elif tag == "p" and "col-9" in _attr(attrs, "class"):
+            self.capture = "p"
+            self.current_text = []
 
     def handle_data(self, data):
-        if self.in_a:
+        if self.capture:
             self.current_text.append(data)
-        if self.in_desc:
-            self.current_desc.append(data)
 
     def handle_endtag(self, tag):
-        if tag == "a" and self.in_a:
-            text = " ".join(self.current_text)
-            text = re.sub(r"\s+", " ", text).strip()
-            href = self.current_href.lstrip("/")
-            if href:
-                self.items.append({
-                    "repo": href,
-                    "display": text,
-                    "desc": ""
-                })
-            self.in_a = False
-            self.current_href = None
-            self.current_text = []
         if tag == "h2":
             self.in_h2 = False
-        if tag == "p" and self.in_desc:
-            desc = " ".join(self.current_desc)
-            desc = re.sub(r"\s+", " ", desc).strip()
-            if self.items and not self.items[-1]["desc"]:
-                self.items[-1]["desc"] = desc
-            self.in_desc = False
-            self.current_desc = []
+        elif tag == "article" and self.max_items and len(self.repos) >= self.max_items:
+            raise _EnoughItems
+        if tag != self.capture:
+            if self.capture:
+                self.current_text.append(" ")
+            return
+        if self.descs and not self.descs[-1]:
+            self.descs[-1] = " ".join("".join(self.current_text).split())
+        self.capture = None
+        self.current_text = []
 
 
-def fetch_trending():
-    req = Request(TRENDING_URL, headers={"User-Agent": "Mozilla/5.0"})
-    html = urlopen(req, timeout=20).read().decode("utf-8", errors="ignore")
-    parser = TrendingParser()
-    parser.feed(html)
-    return parser.items
+def _attr(attrs, name):
+    for key, value in attrs:
+        if key == name:
+            return value or ""
+    return ""
+
+
+def _connection(host, timeout):
+    # one keep-alive connection per (thread, host) so repeated requests skip the TCP/TLS handshake
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(host)
+    if conn is None:
+        conn = conns[host] = _new_connection(host, timeout)
+    return conn
 
 
-def filter_ai(items):
-    result = []
-    for it in items:
-        hay = f"{it.get('repo','')} {it.get('desc','')}".lower()
-        if KEYWORD in hay:
-            result.append(it)
-    return result
+def _new_connection(host, timeout):
+    # honour https_proxy / no_proxy the way urlopen did, tunnelling TLS through CONNECT
+    proxy = getproxies().get("https")
+    if not proxy or proxy_bypass(host.split(":")[0]):
+        return HTTPSConnection(host, timeout=timeout)
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urlsplit(proxy)
+    conn = HTTPSConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    tunnel_headers = {}
+    if parts.username:
+        creds = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode("ascii")
+    conn.set_tunnel(host, headers=tunnel_headers)
+    return conn
 
 
-def fetch_readme(repo):
-    for branch in ["main", "master"]:
-        url = f"https://raw.githubusercontent.com/{repo}/{branch}/README.md"
+def _open(url, headers=None, timeout=15):
+    # returns (conn, resp) with the body unread; callers must read it fully or close conn
+    for _ in range(HTTP_MAX_REDIRECTS):
+        conn, resp = _send(url, headers, timeout)
+        location = resp.getheader("Location")
+        if resp.status not in REDIRECT_STATUSES or not location:
+            return conn, resp
+        resp.read()
+        url = urljoin(url, location)
+    return _send(url, headers, timeout)
+
+
+def _send(url, headers, timeout):
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    headers = {"User-Agent": USER_AGENT, **(headers or {})}
+    for attempt in range(HTTP_RETRIES + 1):
+        conn = _connection(parts.netloc, timeout)
         try:
-            req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-            data = urlopen(req, timeout=15).read().decode("utf-8", errors="ignore")
-            return data[:README_MAX_CHARS]
-        except HTTPError:
-            continue
-        except Exception:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+        except (HTTPException, OSError):
+            # stale keep-alive or network error: drop the socket, it reconnects on next request
+            conn.close()
+            if attempt == HTTP_RETRIES:
+                raise
+            time.sleep(_backoff(attempt))
             continue
-    return ""
+        delay = _retry_delay(resp, attempt)
+        if delay is None or attempt == HTTP_RETRIES:
+            return conn, resp
+        resp.read()
+        time.sleep(delay)
+
+
+def _backoff(attempt):
+    # jitter keeps concurrent workers from retrying in lockstep
+    return HTTP_BACKOFF * (2 ** attempt) + random.uniform(0, HTTP_BACKOFF)
+
 
+def _retry_delay(resp, attempt):
+    # None when the response is final; 403 only counts as throttling when it carries Retry-After
+    retry_after = resp.getheader("Retry-After")
+    if resp.status not in RETRY_STATUSES and not (resp.status == 403 and retry_after):
+        return None
+    if retry_after and retry_after.isdigit():
+        return min(int(retry_after), HTTP_MAX_RETRY_AFTER) + random.uniform(0, HTTP_BACKOFF)
+    return _backoff(attempt)
+
+
+def http_get(url, headers=None, timeout=15, max_bytes=None):
+    with _inflight:
+        conn, resp = _open(url, headers, timeout)
+        try:
+            body = resp.read(max_bytes) if max_bytes else resp.read()
+        except (HTTPException, OSError):
+            conn.close()
+            raise
+    if not resp.isclosed():
+        # body was cut short; the unread tail makes this socket unusable for the next request
+        conn.close()
+    return resp.status, resp.headers, body
 
-def extract_section(text, patterns):
+
+def fetch_trending():
+    conn, resp = _open(TRENDING_URL, timeout=20)
+    if resp.status != 200:
+        conn.close()
+        raise RuntimeError(f"GitHub Trending returned HTTP {resp.status}")
+    parser = TrendingParser(max_items=TRENDING_MAX_ITEMS)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    try:
+        for chunk in iter(lambda: resp.read(TRENDING_CHUNK_SIZE), b""):
+            parser.feed(decoder.decode(chunk))
+    except _EnoughItems:
+        # the rest of the page is footer and scripts; leave it unread and drop the socket
+        conn.close()
+    return parser.repos, parser.descs
+
+
+def filter_ai(repos, descs):
+    keep = [i for i, (repo, desc) in enumerate(zip(repos, descs))
+            if _KEYWORD_RE.search(repo) or _KEYWORD_RE.search(desc)]
+    return [repos[i] for i in keep], [descs[i] for i in keep]
+
+
+def _fetch_branch(repo, branch, etag=None):
+    url = f"https://raw.githubusercontent.com/{repo}/{branch}/README.md"
+    headers = {"If-None-Match": etag} if etag else {}
+    try:
+        # 4 bytes per char covers worst-case UTF-8, so the slice below is never short
+        return http_get(url, headers, timeout=15, max_bytes=README_MAX_CHARS * 4)
+    except Exception:
+        return None, None, b""
+
+
+def _readme_entry(branch, resp_headers, body):
+    text = body.decode("utf-8", errors="ignore")[:README_MAX_CHARS]
+    etag = resp_headers.get("ETag")
+    return text, ({"branch": branch, "etag": etag, "text": text} if etag else None)
+
+
+def fetch_readme(repo, cached=None):
+    # returns (text, cache entry); a cached ETag turns an unchanged README into a bodyless 304
+    if cached and cached.get("branch") in README_BRANCHES:
+        status, resp_headers, body = _fetch_branch(repo, cached["branch"], cached.get("etag"))
+        if status == 304 and cached.get("etag"):
+            return cached["text"], cached
+        if status == 200:
+            return _readme_entry(cached["branch"], resp_headers, body)
+
+    # default branch unknown: probe every candidate at once and keep the first 200
+    futures = {_BRANCH_POOL.submit(_fetch_branch, repo, branch): branch for branch in README_BRANCHES}
+    for fut in as_completed(futures):
+        status, resp_headers, body = fut.result()
+        if status == 200:
+            for other in futures:
+                other.cancel()
+            return _readme_entry(futures[fut], resp_headers, body)
+    return "", None
+
+
+def fetch_readmes(repos, cache=None):
+    # pure I/O: run concurrently so total latency is the slowest fetch, not the sum
+    if not repos:
+        return []
+    cache = {} if cache is None else cache
+    with ThreadPoolExecutor(max_workers=min(README_WORKERS, len(repos))) as ex:
+        results = list(ex.map(fetch_readme, repos, [cache.get(r) for r in repos]))
+    # keep only today's repos so the cache stays bounded to one report's worth
+    cache.clear()
+    cache.update((repo, entry) for repo, (_, entry) in zip(repos, results) if entry)
+    return [text for text, _ in results]
+
+
+def load_readme_cache(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_readme_cache(path, cache):
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+
+
+def extract_section(text, pattern):
     if not text:
         return ""
     lines = text.splitlines()
-    indices = []
-    for i, line in enumerate(lines):
-        if any(re.search(p, line, re.I) for p in patterns):
-            indices.append(i)
-    if not indices:
+    for start, line in enumerate(lines):
+        if pattern.search(line):
+            break
+    else:
         return ""
-    start = indices[0]
     end = len(lines)
     for j in range(start + 1, len(lines)):
-        if re.match(r"^#", lines[j]):
+        if _HEADING_RE.match(lines[j]):
             end = j
             break
     snippet = "\n".join(lines[start:end]).strip()
-    snippet = re.sub(r"`{3}[\s\S]*?`{3}", "", snippet)
-    snippet = re.sub(r"`[^`]+`", "", snippet)
-    snippet = re.sub(r"\s+", " ", snippet)
+    snippet = _CODEBLOCK_RE.sub("", snippet)
+    snippet = _INLINE_CODE_RE.sub("", snippet)
+    snippet = _WS_RE.sub(" ", snippet)
     return snippet[:400]
 
 
-def summarize_repo_cn(repo, desc):
-    readme = fetch_readme(repo)
-    install = extract_section(readme, [r"installation", r"install", r"setup", r"快速开始", r"安装"])
-    usage = extract_section(readme, [r"usage", r"getting started", r"example", r"使用", r"用法", r"quickstart"])
-    intro = extract_section(readme, [r"^#", r"简介", r"about", r"overview"]) or desc
-
-    scenario = "适合开发者进行 AI 项目实验或快速集成" if desc else "适合开发者进行 AI 项目实验或快速集成"
-    meaning = "提升开发效率或增强 AI 能力的开源项目" if desc else "提供可复用的 AI 能力或工具"
+def summarize_repo_cn(readme, desc):
+    install = extract_section(readme, _INSTALL_RE)
+    usage = extract_section(readme, _USAGE_RE)
+    intro = extract_section(readme, _INTRO_RE) or desc
 
     return {
         "intro": intro.strip() if intro else desc,
         "install": install,
         "usage": usage,
-        "scenario": scenario,
-        "meaning": meaning,
+        "scenario": "适合开发者进行 AI 项目实验或快速集成",
+        "meaning": "提升开发效率或增强 AI 能力的开源项目" if desc else "提供可复用的 AI 能力或工具",
     }
 
 
-def build_markdown(items, date_str):
+def build_markdown(repos, descs, date_str, readme_cache=None):
     lines = []
     lines.append(f"# GitHub AI Trending 日报 - {date_str}")
     lines.append("")
     lines.append(f"数据源：[{TRENDING_URL}]({TRENDING_URL})")
     lines.append("")
-    if not items:
+    if not repos:
         lines.append("今日未匹配到包含 'AI' 关键字的 Trending 项目。")
         return "\n".join(lines)
 
-    lines.append(f"今日共匹配到 {len(items)} 个项目，展示前 {min(TOP_N, len(items))} 个：")
+    lines.append(f"今日共匹配到 {len(repos)} 个项目，展示前 {min(TOP_N, len(repos))} 个：")
     lines.append("")
-    for i, it in enumerate(items[:TOP_N], 1):
-        repo = it["repo"]
-        desc = it.get("desc", "").strip()
-        url = f"https://github.com/{repo}"
-        summary = summarize_repo_cn(repo, desc)
-        lines.append(f"{i}. [{repo}]({url})")
-        if summary.get("intro"):
-            lines.append(f"   - 简介：{summary['intro']}")
-        lines.append(f"   - 适合场景：{summary['scenario']}")
-        if summary.get("install"):
-            lines.append(f"   - 安装方式：{summary['install']}")
-        if summary.get("usage"):
-            lines.append(f"   - 使用方式：{summary['usage']}")
-        lines.append(f"   - 项目意义：{summary['meaning']}")
+    repos = repos[:TOP_N]
+    descs = [desc.strip() for desc in descs[:TOP_N]]
+    wanted = [repo for repo, desc in zip(repos, descs) if len(desc) <= DESC_SUFFICIENT_CHARS]
+    fetched = dict(zip(wanted, fetch_readmes(wanted, readme_cache)))
+    summaries = list(map(summarize_repo_cn, [fetched.get(repo, "") for repo in repos], descs))
+    for i, (repo, summary) in enumerate(zip(repos, summaries), 1):
+        fields = filter(None, [
+            summary["intro"] and f"   - 简介：{summary['intro']}",
+            f"   - 适合场景：{summary['scenario']}",
+            summary["install"] and f"   - 安装方式：{summary['install']}",
+            summary["usage"] and f"   - 使用方式：{summary['usage']}",
+            f"   - 项目意义：{summary['meaning']}",
+        ])
+        lines.append(_ENTRY_TEMPLATE.format(i=i, repo=repo, fields="\n".join(fields)))
     lines.append("")
     lines.append("---")
     lines.append("生成时间（本地）：" + dt.datetime.now().strftime("%Y-%m-%d %H:%M"))
@@ -177,34 +367,42 @@ def build_markdown(items, date_str):
 
 
 def update_readme(latest_path):
-    readme_path = os.path.join(os.getcwd(), "README.md")
-    if not os.path.exists(readme_path):
+    if not README_PATH.exists():
         return
-    with open(readme_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    latest_line = f"- [{os.path.basename(latest_path)}](reports/{os.path.basename(latest_path)})"
-    new_content = re.sub(r"## 最新日报[\s\S]*?## 目录", f"## 最新日报\n\n{latest_line}\n\n## 目录", content, count=1)
-    if new_content == content:
-        # fallback: append
-        new_content = content + f"\n\n## 最新日报\n\n{latest_line}\n"
+    latest_line = f"- [{latest_path.name}](reports/{latest_path.name})"
+    section = f"## 最新日报\n\n{latest_line}\n\n## 目录".encode("utf-8")
 
-    with open(readme_path, "w", encoding="utf-8") as f:
-        f.write(new_content)
+    with README_PATH.open("r+b") as f:
+        content = f.read()
+        start = content.find(_LATEST_HEADING)
+        end = content.find(_TOC_HEADING, start) if start != -1 else -1
+        if end == -1:
+            # fallback: append
+            f.write(f"\n\n## 最新日报\n\n{latest_line}\n".encode("utf-8"))
+            return
+        end += len(_TOC_HEADING)
+        if content[start:end] == section:
+            return
+        # patch in place; only rewrite the tail when the section changes length
+        f.seek(start)
+        if len(section) == end - start:
+            f.write(section)
+        else:
+            f.write(section + content[end:])
+            f.truncate()
 
 
 def main():
-    items = fetch_trending()
-    ai_items = filter_ai(items)
+    repos, descs = filter_ai(*fetch_trending())
 
     today = dt.date.today().strftime("%Y-%m-%d")
-    reports_dir = os.path.join(os.getcwd(), "reports")
-    os.makedirs(reports_dir, exist_ok=True)
-    out_path = os.path.join(reports_dir, f"{today}.md")
+    REPORTS_DIR.mkdir(exist_ok=True)
+    out_path = REPORTS_DIR / f"{today}.md"
 
-    md = build_markdown(ai_items, today)
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(md)
+    readme_cache = load_readme_cache(README_CACHE_PATH)
+    md = build_markdown(repos, descs, today, readme_cache)
+    out_path.write_text(md, encoding="utf-8")
+    save_readme_cache(README_CACHE_PATH, readme_cache)
 
     update_readme(out_path)
     print(out_path)